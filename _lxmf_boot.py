@@ -0,0 +1,63 @@
+# Shared Reticulum and LXMF startup for the Zork game servers
+# Every server needs the same identity, destination, router and logging setup, so it lives here once
+
+import sys
+import queue
+import logging
+import logging.handlers
+
+import RNS
+import LXMF
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue records unformatted so the listener thread does the formatting.
+    Arguments are formatted later on that thread, so pass values that won't
+    change in the meantime (strings and numbers, str(e) for exceptions)."""
+    def prepare(self, record):
+        return record
+
+def queued_logger(name):
+    """Set up an INFO logger whose calls only enqueue a record.
+    
+    A listener thread formats the records and writes them to stdout. Returns
+    (logger, listener); the listener is already running, stop it at shutdown.
+    """
+    log_queue = queue.SimpleQueue()
+    log = logging.getLogger(name)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    log.addHandler(DeferredQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return log, listener
+
+def boot(app_name, identity_file="zork_server_identity", storage_path="./lxmf_storage"):
+    """Start Reticulum and set up the server's identity, destination and LXMF router.
+    
+    Returns (identity, destination, router, lxmf_destination).
+    """
+    RNS.Reticulum()
+    
+    # Load the identity so the server keeps the same address across restarts,
+    # creating and saving a new one the first time
+    identity = RNS.Identity.from_file(identity_file)
+    if identity is not None:
+        print(f"Loaded existing identity from {identity_file}")
+    else:
+        identity = RNS.Identity()
+        identity.to_file(identity_file)
+        print(f"Created new identity and saved to {identity_file}")
+    
+    # The endpoint clients send messages to
+    destination = RNS.Destination(
+        identity,
+        RNS.Destination.IN,
+        RNS.Destination.SINGLE,
+        app_name
+    )
+    
+    # The LXMF router, plus our delivery destination used as the source of replies
+    router = LXMF.LXMRouter(storagepath=storage_path)
+    lxmf_destination = router.register_delivery_identity(identity)
+    
+    return identity, destination, router, lxmf_destination
@@ -0,0 +1,14 @@
+# Reply text shared by the Zork game servers
+
+# Replies for unknown verbs already seen; capped because verbs come from players
+_UNKNOWN_REPLIES = {}
+MAX_UNKNOWN_REPLIES = 256
+
+def unknown_verb_reply(verb):
+    """Reply to a verb that has no command"""
+    reply = _UNKNOWN_REPLIES.get(verb)
+    if reply is None:
+        reply = f"I don't understand '{verb}'. Type 'help' for available commands."
+        if len(_UNKNOWN_REPLIES) < MAX_UNKNOWN_REPLIES:
+            _UNKNOWN_REPLIES[verb] = reply
+    return reply
@@ -4,9 +4,10 @@
 
 import RNS
 import LXMF
-import time
 import threading
 
+from _lxmf_boot import boot
+
 # --- Game Data and State ---
 # This is the simplest possible way to represent the game world.
 # It's a dictionary where each key is a "room" and the value is another
@@ -27,47 +28,26 @@ GAME_WORLD = {
 }
 
 # This dictionary will store the state of each player.
-# The key will be the player's unique LXMF address (as a string).
+# The key will be the player's unique LXMF address (as raw bytes).
 # The value will be the 'room' key from GAME_WORLD where the player currently is.
 # This is how we achieve persistence and support multiple players.
 player_states = {}
 
 # --- Reticulum and LXMF Setup ---
 
-# This part is standard for any Reticulum application.
-# We first initialize Reticulum.
-RNS.Reticulum()
-
 # Define a name for our LXMF endpoint. This is like a username for our application.
 # The destination will be created based on this name.
 APP_NAME = "zork_game"
 
-# Create a Reticulum Identity. This is the cryptographic identity of our server.
-# We load from a file to maintain the same address across restarts.
-identity_file = "zork_server_identity"
-if RNS.Identity.from_file(identity_file):
-    identity = RNS.Identity.from_file(identity_file)
-    print(f"Loaded existing identity from {identity_file}")
-else:
-    identity = RNS.Identity()
-    identity.to_file(identity_file)
-    print(f"Created new identity and saved to {identity_file}")
-
-# Create the LXMF endpoint (a "destination") for our server.
-# This is the address that clients will send messages to.
-destination = RNS.Destination(
-    identity,
-    RNS.Destination.IN,
-    RNS.Destination.SINGLE,
-    APP_NAME
-)
-
-# Create LXMF router to handle messages
-router = LXMF.LXMRouter(storagepath="./lxmf_storage")
-
-# Register our destination with the router so it can receive messages
-# This returns our LXMF destination that we'll use as the source for outbound messages
-lxmf_destination = router.register_delivery_identity(identity)
+# This part is standard for any Reticulum application, so it lives in the
+# shared _lxmf_boot module. boot() does four things:
+# 1. Initializes Reticulum.
+# 2. Loads our server's cryptographic Identity from a file (or creates and
+#    saves a new one), so we keep the same address across restarts.
+# 3. Creates the LXMF endpoint (a "destination") that clients send messages to.
+# 4. Creates the LXMF router and registers our identity with it. This gives us
+#    the LXMF destination we use as the source for outbound messages.
+identity, destination, router, lxmf_destination = boot(APP_NAME, "zork_server_identity")
 
 
 # --- Message Handling ---
@@ -78,8 +58,9 @@ def message_received(message):
     by LXMF every time a new message arrives at our destination.
     """
     # Get the sender's address. This is how we know who sent the message.
-    # We convert it to a hex string to use it as a dictionary key.
-    sender_address = message.source_hash.hex()
+    # The raw bytes work directly as a dictionary key, so there is no need
+    # to convert them to a hex string first.
+    sender_address = message.source_hash
 
     # Get the content of the message (what the player typed).
     # We convert it to lowercase and remove leading/trailing whitespace.
@@ -181,6 +162,10 @@ def message_received(message):
 
 # --- Main Program Loop ---
 
+# This event is set when the server should stop. Waiting on it blocks the
+# main thread without waking up periodically, unlike a sleep loop.
+_shutdown = threading.Event()
+
 def main():
     # Tell LXMF to call our `message_received` function for every new message.
     router.register_delivery_callback(message_received)
@@ -188,16 +173,16 @@ def main():
     print("Zork Server Initialized.")
     print(f"Listening for messages at: {RNS.prettyhexrep(destination.hash)}")
 
-    # This loop keeps the program running and listening for messages.
-    # It will run forever until you stop it with Ctrl+C.
-    while True:
-        time.sleep(1)
+    # Block here, keeping the program running and listening for messages.
+    # It will wait forever until you stop it with Ctrl+C.
+    _shutdown.wait()
 
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
+        _shutdown.set()
         print("Shutting down server.")
         # This is a clean way to exit.
         # It's important to call RNS.Reticulum.exit() to allow Reticulum
@@ -0,0 +1,56 @@
+# Load-time checks for the event scripts in scriptable game configs
+# Kept apart from zork_scriptable so it can be imported without starting Reticulum
+
+import ast
+import builtins
+
+class ScriptValidationError(ValueError):
+    """Raised when an event script fails to parse or uses a disallowed construct"""
+
+# Builtins scripts may not use; they would reach outside the game state.
+# Together with the dunder check and SCRIPT_BUILTINS this catches mistakes in
+# trusted game configs - it is not a sandbox for untrusted code (generator
+# frames and str.format can still reach further)
+FORBIDDEN_SCRIPT_NAMES = frozenset({
+    '__builtins__', '__import__', 'eval', 'exec', 'compile', 'open',
+    'globals', 'locals', 'vars', 'breakpoint', 'getattr', 'setattr', 'delattr',
+    'type', 'input', 'exit', 'quit', 'help',
+})
+
+# The builtins scripts run with: everything except the names above and dunders
+SCRIPT_BUILTINS = {name: value for name, value in vars(builtins).items()
+                   if name not in FORBIDDEN_SCRIPT_NAMES and not name.startswith('_')}
+
+def bound_names(tree: ast.AST) -> set:
+    """Every name the script assigns, deletes, defines or takes as an argument"""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.ExceptHandler, ast.MatchAs, ast.MatchStar)) and node.name:
+            names.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            names.add(node.rest)
+    return names
+
+def validate_script(tree: ast.AST):
+    """Reject imports, global declarations, dunder attributes and reads of forbidden builtins.
+
+    A forbidden builtin name the script binds itself (exit = ..., for type
+    in ...) is an ordinary local and allowed; the dunder names never are.
+    """
+    local_names = bound_names(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            raise ScriptValidationError(f"line {node.lineno}: imports are not allowed")
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            raise ScriptValidationError(f"line {node.lineno}: global declarations are not allowed")
+        if isinstance(node, ast.Name) and node.id in FORBIDDEN_SCRIPT_NAMES and (
+                node.id.startswith('__') or isinstance(node.ctx, ast.Load) and node.id not in local_names):
+            raise ScriptValidationError(f"line {node.lineno}: '{node.id}' is not allowed")
+        if isinstance(node, ast.Attribute) and node.attr.startswith('__') and node.attr.endswith('__'):
+            raise ScriptValidationError(f"line {node.lineno}: access to '{node.attr}' is not allowed")
@@ -0,0 +1,84 @@
+# Static analysis of a loaded scriptable game world
+# Walks the room graph once at startup so broken or unreachable rooms show up before players find them
+
+from collections import deque
+
+def effect_room_targets(item):
+    """Room IDs an item's verb effects can open an exit to or teleport a player into"""
+    targets = set()
+    for interaction in item.verb_interactions.values():
+        if not isinstance(interaction, dict):
+            continue
+        effects = interaction.get('effects') or {}
+        exit_effect = effects.get('add_room_exit')
+        if isinstance(exit_effect, dict) and exit_effect.get('to_room'):
+            targets.add(exit_effect['to_room'])
+        if isinstance(effects.get('teleport_to'), str):
+            targets.add(effects['teleport_to'])
+    return targets
+
+def index_rooms(game_state):
+    """Number the rooms and build a parallel table of exit targets by number.
+
+    Returns (room_ids, room_index, exit_table): exit_table[i] lists the room
+    numbers room i's exits lead to, with -1 for a missing room.
+    """
+    room_ids = list(game_state.rooms)
+    room_index = {room_id: index for index, room_id in enumerate(room_ids)}
+    exit_table = [[room_index.get(target, -1) for target in room.exits.values()]
+                  for room in game_state.rooms.values()]
+    return room_ids, room_index, exit_table
+
+def reachable_rooms(exit_table, starts, seen=None):
+    """Breadth-first search over room numbers; returns a bytearray of reached flags.
+
+    Pass the bytearray from an earlier call as seen to extend that search.
+    """
+    if seen is None:
+        seen = bytearray(len(exit_table))
+    queue = deque()
+    for start in starts:
+        if start >= 0 and not seen[start]:
+            seen[start] = 1
+            queue.append(start)
+    while queue:
+        for next_room in exit_table[queue.popleft()]:
+            if next_room >= 0 and not seen[next_room]:
+                seen[next_room] = 1
+                queue.append(next_room)
+    return seen
+
+def unreachable_rooms(game_state):
+    """Rooms no exit or verb effect leads to from the starting room, in config order.
+
+    An item's effects only count once the room it starts in has been reached,
+    since the player can then carry it anywhere reached. Event scripts can
+    also add exits and place items, so these are candidates to check rather
+    than definite dead rooms.
+    """
+    room_ids, room_index, exit_table = index_rooms(game_state)
+    # Room number -> effect targets of the items that start there
+    pending = {}
+    for room_id, room in game_state.rooms.items():
+        targets = set()
+        for item in room.items:
+            targets |= effect_room_targets(item)
+        if targets:
+            pending[room_index[room_id]] = targets
+
+    seen = None
+    starts = [room_index.get(game_state.starting_room, -1)]
+    while True:
+        seen = reachable_rooms(exit_table, starts, seen)
+        opened = [number for number in pending if seen[number]]
+        if not opened:
+            break
+        starts = [room_index.get(target, -1) for number in opened for target in pending.pop(number)]
+    return [room_id for room_id, reached in zip(room_ids, seen) if not reached]
+
+def dangling_exits(game_state):
+    """(room_id, direction, target) for every exit that points at a missing room"""
+    return [(room_id, direction, target)
+            for room_id, room in game_state.rooms.items()
+            for direction, target in room.exits.items()
+            if target not in game_state.rooms]
@@ -0,0 +1,26 @@
+import ast
+
+import pytest
+
+from script_check import ScriptValidationError, validate_script
+
+def check(script):
+    validate_script(ast.parse(script))
+
+def test_forbidden_names_as_locals_are_allowed():
+    check("exit = event.data.get('direction')\n"
+          "type = 'gold'\n"
+          "for help in ['a', 'b']:\n"
+          "    response = exit or type or help")
+
+@pytest.mark.parametrize('script', [
+    "exit()",
+    "response = type(player)",
+    "import os",
+    "global response",
+    "response = player.__class__",
+    "__builtins__ = {}",
+])
+def test_rejected_scripts(script):
+    with pytest.raises(ScriptValidationError):
+        check(script)
@@ -3,80 +3,102 @@
 
 import RNS
 import LXMF
-import time
 import threading
-import json
-import copy
+import queue
+from dataclasses import dataclass, field
+
+from _lxmf_boot import boot, queued_logger
+from _zork_replies import unknown_verb_reply
+
+# --- Logging ---
+
+log, LOG_LISTENER = queued_logger("zork_enhanced")
 
 # --- Game World Data Structures ---
 
+@dataclass(frozen=True, slots=True)
 class GameItem:
-    def __init__(self, name, description, can_take=True, aliases=None):
-        self.name = name
-        self.description = description
-        self.can_take = can_take
-        self.aliases = aliases or []
-        self.hidden = False
+    """Immutable item description, shared by every player"""
+    name: str
+    description: str
+    can_take: bool = True
+    aliases: tuple = ()
+    hidden: bool = False
+    _match_keys: frozenset = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Frozen, so normalized and derived fields go through object.__setattr__
+        object.__setattr__(self, 'aliases', tuple(self.aliases))
+        object.__setattr__(self, '_match_keys', frozenset(key.lower() for key in (self.name, *self.aliases)))
     
     def matches(self, text):
         """Check if the given text matches this item"""
-        return text.lower() in [self.name.lower()] + [alias.lower() for alias in self.aliases]
+        return text.lower() in self._match_keys
 
 class GameRoom:
+    __slots__ = ('name', 'description', 'exits', 'exits_str', 'items', 'visited', '_cached_view')
+    
     def __init__(self, name, description, exits=None, items=None):
         self.name = name
         self.description = description
         self.exits = exits or {}
-        self.items = items or []
+        self.exits_str = ', '.join(self.exits)  # Exits never change, so join them once
+        # Starting item keys, shared by all players (a dict keeps their order
+        # and gives O(1) membership tests)
+        self.items = dict.fromkeys(items or ())
         self.visited = False
-    
-    def get_item(self, item_name):
-        """Get an item from this room by name"""
-        for item in self.items:
-            if item.matches(item_name):
-                return item
-        return None
-    
-    def remove_item(self, item):
-        """Remove an item from this room"""
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
-    
-    def add_item(self, item):
-        """Add an item to this room"""
-        self.items.append(item)
+        self._cached_view = None  # Rendered 'look' text for the starting items
 
 class Player:
+    __slots__ = ('address', 'pretty_hex', 'current_room', 'inventory', 'room_contents',
+                 'room_views', 'max_inventory', 'score', 'moves')
+    
     def __init__(self, address):
-        self.address = address
+        self.address = address  # Raw LXMF source hash
+        self.pretty_hex = RNS.prettyhexrep(address)  # Formatted once for logging
         self.current_room = 'entrance_hall'
-        self.inventory = []
+        self.inventory = {}  # Carried item keys, in pickup order
+        self.room_contents = {}  # Room key -> item keys, copied from the room on first change
+        self.room_views = {}  # Room key -> rendered 'look' text for rooms in room_contents
         self.max_inventory = 10
         self.score = 0
         self.moves = 0
     
+    def get_room_items(self, room_key):
+        """Get the item keys this player sees in a room"""
+        contents = self.room_contents.get(room_key)
+        if contents is None:
+            return GAME_WORLD[room_key].items
+        return contents
+    
+    def _own_room_items(self, room_key):
+        """Get this player's private copy of a room's item keys, making it if needed"""
+        contents = self.room_contents.get(room_key)
+        if contents is None:
+            contents = self.room_contents[room_key] = dict(GAME_WORLD[room_key].items)
+        return contents
+    
     def get_item(self, item_name):
-        """Get an item from player's inventory by name"""
-        for item in self.inventory:
-            if item.matches(item_name):
-                return item
-        return None
-    
-    def add_item(self, item):
-        """Add an item to player's inventory"""
-        if len(self.inventory) < self.max_inventory:
-            self.inventory.append(item)
-            return True
-        return False
-    
-    def remove_item(self, item):
-        """Remove an item from player's inventory"""
-        if item in self.inventory:
-            self.inventory.remove(item)
-            return True
-        return False
+        """Get the key of an item in player's inventory by name"""
+        return find_item(self.inventory, item_name)
+    
+    def take_item(self, room_key, item_key):
+        """Move an item from a room into player's inventory"""
+        if len(self.inventory) >= self.max_inventory:
+            return False
+        del self._own_room_items(room_key)[item_key]
+        self.inventory[item_key] = None
+        self.room_views.pop(room_key, None)
+        return True
+    
+    def drop_item(self, room_key, item_key):
+        """Move an item from player's inventory into a room"""
+        if item_key not in self.inventory:
+            return False
+        del self.inventory[item_key]
+        self._own_room_items(room_key)[item_key] = None
+        self.room_views.pop(room_key, None)
+        return True
 
 # --- Game World Definition ---
 
@@ -93,25 +115,39 @@ GAME_ITEMS = {
     'crystal': GameItem('crystal', 'A glowing crystal that pulses with inner light.', True, ['gem']),
 }
 
-# Create game rooms with items
+# Index every lowercased name and alias to the item keys it can refer to,
+# so item lookups are a dict hit instead of a scan over each container
+ALIAS_TO_ITEMS = {}
+for _item_key, _item in GAME_ITEMS.items():
+    for _key in _item._match_keys:
+        ALIAS_TO_ITEMS[_key] = ALIAS_TO_ITEMS.get(_key, ()) + (_item_key,)
+
+def find_item(item_keys, item_name):
+    """Find the key of the item named by the text among the given item keys"""
+    for item_key in ALIAS_TO_ITEMS.get(item_name.lower(), ()):
+        if item_key in item_keys:
+            return item_key
+    return None
+
+# Create game rooms with the keys of their starting items
 GAME_WORLD = {
     'entrance_hall': GameRoom(
         'Entrance Hall',
         'You are standing in an open field west of a white house, with a boarded front door. There is a small mailbox here.',
         {'north': 'forest_path', 'south': 'garden', 'east': 'living_room'},
-        [GAME_ITEMS['mailbox'], GAME_ITEMS['leaflet']]
+        ['mailbox', 'leaflet']
     ),
     'living_room': GameRoom(
         'Living Room',
         'You are in the living room. There is a doorway to the west and a wooden staircase leading upward.',
         {'west': 'entrance_hall', 'up': 'attic'},
-        [GAME_ITEMS['brass_lantern']]
+        ['brass_lantern']
     ),
     'attic': GameRoom(
         'Attic',
         'You are in the attic. The room is dimly lit by small windows. There is a ladder leading down.',
         {'down': 'living_room'},
-        [GAME_ITEMS['rope']]
+        ['rope']
     ),
     'forest_path': GameRoom(
         'Forest Path',
@@ -123,7 +159,7 @@ GAME_WORLD = {
         'Forest Clearing',
         'You are in a small clearing surrounded by tall trees. Sunlight filters through the canopy above.',
         {'south': 'forest_path', 'east': 'cave_entrance'},
-        [GAME_ITEMS['sword']]
+        ['sword']
     ),
     'cave_entrance': GameRoom(
         'Cave Entrance',
@@ -141,7 +177,7 @@ GAME_WORLD = {
         'Treasure Room',
         'You have discovered a hidden treasure room! Ancient treasures glitter in the dim light.',
         {'south': 'cave'},
-        [GAME_ITEMS['chest'], GAME_ITEMS['key'], GAME_ITEMS['crystal']]
+        ['chest', 'key', 'crystal']
     ),
     'garden': GameRoom(
         'Garden',
@@ -152,36 +188,81 @@ GAME_WORLD = {
 }
 
 # --- Player Management ---
-players = {}  # Dictionary to store player objects by address
+players = {}  # Dictionary to store player objects by raw source hash bytes
 
 def get_player(address):
     """Get or create a player object"""
-    if address not in players:
-        players[address] = Player(address)
-        print(f"New player created: {RNS.prettyhexrep(bytes.fromhex(address))}")
-    return players[address]
+    player = players.get(address)
+    if player is None:
+        player = players[address] = Player(address)
+        log.info("New player created: %s", player.pretty_hex)
+    return player
 
 # --- Game Commands ---
 
+NO_ARGS = ()  # Shared empty argument list for internal command calls
+
+# Pre-encoded payloads for responses that are sent over and over (room views
+# and help), keyed by id() so dynamic replies cost an int hash rather than a
+# hash of their whole text. Each entry holds its string, so the id cannot be
+# reused while cached; anything else is encoded by LXMF
+RESPONSE_BYTES = {}
+
+def pre_encode(text):
+    """Cache the encoded payload for a response string that will be returned as-is"""
+    RESPONSE_BYTES[id(text)] = (text, text.encode('utf-8'))
+    return text
+
+def encode_response(text):
+    """Get the message content for a response, reusing pre-encoded bytes when available"""
+    entry = RESPONSE_BYTES.get(id(text))
+    return text if entry is None else entry[1]
+
+# Per-thread scratch list reused when assembling multi-line responses
+_SCRATCH = threading.local()
+
+def scratch_parts():
+    """Get this thread's response scratch list, emptied for reuse"""
+    parts = getattr(_SCRATCH, 'parts', None)
+    if parts is None:
+        parts = _SCRATCH.parts = []
+    else:
+        parts.clear()
+    return parts
+
+def render_room(room, item_keys):
+    """Build the 'look' text for a room holding the given items"""
+    parts = scratch_parts()
+    parts.extend((room.name, '\n', room.description))
+    
+    # List visible items
+    visible_items = [GAME_ITEMS[item_key] for item_key in item_keys if not GAME_ITEMS[item_key].hidden]
+    if visible_items:
+        parts.append("\n\nYou can see:")
+        for item in visible_items:
+            parts.append(f"\n  {item.name}")
+    
+    # List exits
+    if room.exits:
+        parts.append(f"\n\nExits: {room.exits_str}")
+    
+    return ''.join(parts)
+
 def cmd_look(player, args):
     """Look around the current room or at a specific item"""
     current_room = GAME_WORLD[player.current_room]
     
     if not args:
-        # Look around the room
-        response = f"{current_room.name}\n{current_room.description}"
-        
-        # List visible items
-        if current_room.items:
-            visible_items = [item for item in current_room.items if not item.hidden]
-            if visible_items:
-                response += "\n\nYou can see:"
-                for item in visible_items:
-                    response += f"\n  {item.name}"
-        
-        # List exits
-        if current_room.exits:
-            response += f"\n\nExits: {', '.join(current_room.exits.keys())}"
+        response = player.room_views.get(player.current_room)
+        if response is None:
+            contents = player.room_contents.get(player.current_room)
+            if contents is None:
+                # The player hasn't changed this room, so share its cached view
+                response = current_room._cached_view
+                if response is None:
+                    response = current_room._cached_view = pre_encode(render_room(current_room, current_room.items))
+            else:
+                response = player.room_views[player.current_room] = render_room(current_room, contents)
         
         current_room.visited = True
         return response
@@ -190,13 +271,13 @@ def cmd_look(player, args):
         item_name = ' '.join(args)
         
         # Check room first
-        item = current_room.get_item(item_name)
-        if not item:
+        item_key = find_item(player.get_room_items(player.current_room), item_name)
+        if item_key is None:
             # Check inventory
-            item = player.get_item(item_name)
+            item_key = player.get_item(item_name)
         
-        if item:
-            return item.description
+        if item_key is not None:
+            return GAME_ITEMS[item_key].description
         else:
             return f"You don't see any '{item_name}' here."
 
@@ -206,20 +287,18 @@ def cmd_take(player, args):
         return "Take what?"
     
     item_name = ' '.join(args)
-    current_room = GAME_WORLD[player.current_room]
-    item = current_room.get_item(item_name)
+    item_key = find_item(player.get_room_items(player.current_room), item_name)
     
-    if not item:
+    if item_key is None:
         return f"There is no '{item_name}' here."
     
+    item = GAME_ITEMS[item_key]
     if not item.can_take:
         return f"You can't take the {item.name}."
     
-    if len(player.inventory) >= player.max_inventory:
+    if not player.take_item(player.current_room, item_key):
         return "Your inventory is full!"
     
-    current_room.remove_item(item)
-    player.add_item(item)
     player.score += 5
     return f"Taken: {item.name}."
 
@@ -229,25 +308,24 @@ def cmd_drop(player, args):
         return "Drop what?"
     
     item_name = ' '.join(args)
-    item = player.get_item(item_name)
+    item_key = player.get_item(item_name)
     
-    if not item:
+    if item_key is None:
         return f"You don't have any '{item_name}'."
     
-    current_room = GAME_WORLD[player.current_room]
-    player.remove_item(item)
-    current_room.add_item(item)
-    return f"Dropped: {item.name}."
+    player.drop_item(player.current_room, item_key)
+    return f"Dropped: {GAME_ITEMS[item_key].name}."
 
 def cmd_inventory(player, args):
     """Show player's inventory"""
     if not player.inventory:
         return "You are carrying nothing."
     
-    response = "You are carrying:"
-    for item in player.inventory:
-        response += f"\n  {item.name}"
-    return response
+    parts = scratch_parts()
+    parts.append("You are carrying:")
+    for item_key in player.inventory:
+        parts.append(f"\n  {GAME_ITEMS[item_key].name}")
+    return ''.join(parts)
 
 def cmd_go(player, args):
     """Move to another room"""
@@ -265,7 +343,7 @@ def cmd_go(player, args):
     player.moves += 1
     
     # Automatically look around the new room
-    return cmd_look(player, [])
+    return cmd_look(player, NO_ARGS)
 
 def cmd_examine(player, args):
     """Examine an item closely (alias for look)"""
@@ -275,9 +353,7 @@ def cmd_score(player, args):
     """Show player's score and statistics"""
     return f"Score: {player.score} points\nMoves: {player.moves}\nItems carried: {len(player.inventory)}/{player.max_inventory}"
 
-def cmd_help(player, args):
-    """Show available commands"""
-    return """Available commands:
+HELP_TEXT = """Available commands:
 look [item] - Look around or examine an item
 take <item> - Take an item
 drop <item> - Drop an item from your inventory
@@ -289,6 +365,11 @@ help - Show this help message
 quit - Quit the game
 
 You can use abbreviated forms: l (look), t (take), d (drop), i (inventory), x (examine)"""
+pre_encode(HELP_TEXT)
+
+def cmd_help(player, args):
+    """Show available commands"""
+    return HELP_TEXT
 
 def cmd_quit(player, args):
     """Quit the game"""
@@ -306,102 +387,127 @@ COMMANDS = {
     'help': cmd_help, '?': cmd_help,
     'quit': cmd_quit, 'exit': cmd_quit,
 }
+# Bound once so resolving a verb is a single dict lookup with no membership test
+dispatch_command = COMMANDS.get
 
 # --- LXMF Setup (same as before) ---
 
-RNS.Reticulum()
 APP_NAME = "zork_enhanced"
+identity, destination, router, lxmf_destination = boot(APP_NAME, "zork_server_identity")
+
+# Reply destinations by sender hash, so identity recall and destination
+# setup happen once per player instead of once per command
+REPLY_CACHE = {}
+
+def get_reply_destination(source_hash):
+    """Get the outbound destination for a sender, or None if their identity is unknown"""
+    reply_destination = REPLY_CACHE.get(source_hash)
+    if reply_destination is None:
+        sender_identity = RNS.Identity.recall(source_hash)
+        if sender_identity is None:
+            return None
+        reply_destination = RNS.Destination(
+            sender_identity,
+            RNS.Destination.OUT,
+            RNS.Destination.SINGLE,
+            "lxmf", "delivery"
+        )
+        REPLY_CACHE[source_hash] = reply_destination
+    return reply_destination
 
-# Load or create identity
-identity_file = "zork_server_identity"
-if RNS.Identity.from_file(identity_file):
-    identity = RNS.Identity.from_file(identity_file)
-    print(f"Loaded existing identity from {identity_file}")
-else:
-    identity = RNS.Identity()
-    identity.to_file(identity_file)
-    print(f"Created new identity and saved to {identity_file}")
-
-# Create destination
-destination = RNS.Destination(
-    identity,
-    RNS.Destination.IN,
-    RNS.Destination.SINGLE,
-    APP_NAME
-)
-
-# Create LXMF router
-router = LXMF.LXMRouter(storagepath="./lxmf_storage")
-lxmf_destination = router.register_delivery_identity(identity)
+# Inbound messages, handed from the router's callback to a single game
+# worker so player and world state only ever change on one thread
+INBOX = queue.SimpleQueue()
+MAX_BATCH = 64  # Most messages the worker takes per wakeup
 
 def message_received(message):
-    """Handle incoming game commands"""
-    sender_address = message.source_hash.hex()
+    """Queue an incoming message for the game worker"""
+    INBOX.put(message)
+
+def game_worker():
+    """Handle queued messages in arrival order, draining bursts in batches"""
+    while True:
+        batch = [INBOX.get()]
+        while len(batch) < MAX_BATCH and not INBOX.empty():
+            batch.append(INBOX.get())
+        
+        outbound = []
+        for message in batch:
+            try:
+                player = get_player(message.source_hash)
+                response_message = handle_message(player, message)
+                if response_message is not None:
+                    outbound.append((player, response_message))
+            except Exception as e:
+                log.error("Error handling message: %s", str(e))
+        
+        # Hand the whole batch's replies to the router back to back
+        for player, response_message in outbound:
+            try:
+                router.handle_outbound(response_message)
+            except Exception as e:
+                # Drop the cached destination so the next message rebuilds it
+                REPLY_CACHE.pop(player.address, None)
+                log.error("Error sending response to %s: %s", player.pretty_hex, str(e))
+
+def handle_message(player, message):
+    """Handle a player's incoming game command and return the reply message to send, if any"""
     command_text = message.content.decode('utf-8').strip()
     
-    print(f"Received command '{command_text}' from {RNS.prettyhexrep(message.source_hash)}")
-    
-    # Get or create player
-    player = get_player(sender_address)
+    log.info("Received command '%s' from %s", command_text, player.pretty_hex)
     
-    # Parse command
-    parts = command_text.lower().split()
+    # Parse command (skip the lowercase copy when the text is already lowercase)
+    parts = (command_text if command_text.islower() else command_text.lower()).split()
     if not parts:
         response_text = "Please enter a command. Type 'help' for available commands."
     else:
         verb = parts[0]
         args = parts[1:]
         
-        if verb in COMMANDS:
+        handler = dispatch_command(verb)
+        if handler is None:
+            response_text = unknown_verb_reply(verb)
+        else:
             try:
-                response_text = COMMANDS[verb](player, args)
+                response_text = handler(player, args)
             except Exception as e:
                 response_text = f"Error processing command: {e}"
-                print(f"Command error: {e}")
-        else:
-            response_text = f"I don't understand '{verb}'. Type 'help' for available commands."
+                log.error("Command error: %s", str(e))
     
-    # Send response
-    print(f"Sending game response to {RNS.prettyhexrep(message.source_hash)}: \"{response_text[:50]}...\"")
+    # Build the response; the worker sends it with the rest of its batch
+    payload = encode_response(response_text)
+    log.info("Sending game response to %s: \"%.50s...\"", player.pretty_hex, response_text)
     
     try:
-        sender_identity = RNS.Identity.recall(message.source_hash)
-        if sender_identity is not None:
-            reply_destination = RNS.Destination(
-                sender_identity,
-                RNS.Destination.OUT,
-                RNS.Destination.SINGLE,
-                "lxmf", "delivery"
-            )
-            
-            response_message = LXMF.LXMessage(
+        reply_destination = get_reply_destination(message.source_hash)
+        if reply_destination is not None:
+            return LXMF.LXMessage(
                 reply_destination,
                 lxmf_destination,
-                response_text,
+                payload,
                 desired_method=LXMF.LXMessage.DIRECT
             )
-            
-            router.handle_outbound(response_message)
-            print(f"Response sent to {RNS.prettyhexrep(message.source_hash)}")
-            
-        else:
-            print(f"Could not recall identity for {RNS.prettyhexrep(message.source_hash)}, trying alternative...")
-            if hasattr(message, 'destination') and message.destination is not None:
-                response_message = LXMF.LXMessage(
-                    message.destination,
-                    lxmf_destination,
-                    response_text,
-                    desired_method=LXMF.LXMessage.OPPORTUNISTIC
-                )
-                router.handle_outbound(response_message)
-                print(f"Response sent via alternative method")
-            else:
-                print(f"Cannot send response - no valid destination found")
+        
+        log.info("Could not recall identity for %s, trying alternative...", player.pretty_hex)
+        if hasattr(message, 'destination') and message.destination is not None:
+            return LXMF.LXMessage(
+                message.destination,
+                lxmf_destination,
+                payload,
+                desired_method=LXMF.LXMessage.OPPORTUNISTIC
+            )
+        log.warning("Cannot send response - no valid destination found")
                 
     except Exception as e:
-        print(f"Error sending response: {e}")
+        REPLY_CACHE.pop(player.address, None)
+        log.error("Error preparing response: %s", str(e))
+    return None
+
+# Set when the server should stop; main() blocks on it instead of polling
+_shutdown = threading.Event()
 
 def main():
+    threading.Thread(target=game_worker, daemon=True).start()
     router.register_delivery_callback(message_received)
     
     print("Enhanced Zork Server Initialized.")
@@ -413,12 +519,13 @@ def main():
     print("- Score tracking")
     print("- Multiple game commands")
     
-    while True:
-        time.sleep(1)
+    _shutdown.wait()
 
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
+        _shutdown.set()
         print("Shutting down Enhanced Zork server.")
+        LOG_LISTENER.stop()
         RNS.Reticulum.exit()
\ No newline at end of file
@@ -8,12 +8,35 @@ import threading
 import json
 import copy
 import re
+import string
+import sys
+import ast
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Sequence
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path
 from typing import Dict, List, Any, Optional, Callable
+from _lxmf_boot import boot, queued_logger
+from _zork_replies import unknown_verb_reply
+from script_check import ScriptValidationError, SCRIPT_BUILTINS, validate_script
+from state_search import dangling_exits, unreachable_rooms
+
+try:
+    import orjson  # Optional, faster config parsing
+except ImportError:
+    orjson = None
+
+# --- Logging ---
+
+logger, LOG_LISTENER = queued_logger(__name__)
 
 # --- Event System ---
 
 class GameEvent:
     """Represents a game event that can be triggered"""
+    __slots__ = ('event_type', 'data', 'timestamp')
+    
     def __init__(self, event_type: str, data: Dict[str, Any] = None):
         self.event_type = event_type
         self.data = data or {}
@@ -23,64 +46,119 @@ class EventHandler:
     """Base class for event handlers"""
     def __init__(self, conditions: Dict[str, Any] = None):
         self.conditions = conditions or {}
+        self._checks = self._compile_conditions()
     
-    def can_handle(self, event: GameEvent, game_state: 'GameState') -> bool:
-        """Check if this handler can handle the given event"""
-        # Check event type
-        if 'event_type' in self.conditions:
-            if event.event_type != self.conditions['event_type']:
-                return False
+    def _compile_conditions(self) -> tuple:
+        """Turn the conditions dict into predicates once, instead of per event"""
+        # The event type is matched by the HandlerBuckets lookup in trigger_event
+        checks = []
         
         # Check player conditions
         if 'player_has_item' in self.conditions:
-            player = game_state.get_player(event.data.get('player_address'))
-            if not player or not player.has_item(self.conditions['player_has_item']):
-                return False
+            item_name = self.conditions['player_has_item']
+            def player_has_item(event, game_state):
+                player = game_state.get_player(event.data.get('player_address'))
+                return bool(player) and player.has_item(item_name)
+            checks.append(player_has_item)
         
         # Check room conditions
         if 'player_in_room' in self.conditions:
-            player = game_state.get_player(event.data.get('player_address'))
-            if not player or player.current_room != self.conditions['player_in_room']:
-                return False
+            room_id = self.conditions['player_in_room']
+            def player_in_room(event, game_state):
+                player = game_state.get_player(event.data.get('player_address'))
+                return bool(player) and player.current_room == room_id
+            checks.append(player_in_room)
         
         # Check game flags
         if 'flag_set' in self.conditions:
             flag_name = self.conditions['flag_set']
-            if not game_state.get_flag(flag_name):
-                return False
+            def flag_set(event, game_state):
+                return bool(game_state.get_flag(flag_name))
+            checks.append(flag_set)
         
+        return tuple(checks)
+    
+    def can_handle(self, event: GameEvent, game_state: 'GameState') -> bool:
+        """Check if this handler can handle the given event"""
+        for check in self._checks:
+            if not check(event, game_state):
+                return False
         return True
     
     def handle(self, event: GameEvent, game_state: 'GameState') -> str:
         """Handle the event and return response text"""
         return "Event handled."
 
+class HandlerBuckets:
+    """Event handlers grouped by the event type they listen for.
+    
+    Handlers are added through add(), which files them into their bucket
+    as they arrive; owners build a new instance when their handler list is
+    replaced.
+    """
+    def __init__(self, handlers: List[EventHandler] = ()):
+        self.handlers = []
+        self.by_type = {}
+        self.untyped = []  # Handlers without an event_type condition
+        for handler in handlers:
+            self.add(handler)
+    
+    def add(self, handler: EventHandler):
+        """Register a handler, keeping registration order within every bucket"""
+        self.handlers.append(handler)
+        if 'event_type' not in handler.conditions:
+            self.untyped.append(handler)
+            for bucket in self.by_type.values():
+                bucket.append(handler)
+        else:
+            event_type = handler.conditions['event_type']
+            if event_type not in self.by_type:
+                self.by_type[event_type] = list(self.untyped)
+            self.by_type[event_type].append(handler)
+    
+    def get(self, event_type: str) -> List[EventHandler]:
+        """Handlers that may respond to an event of this type"""
+        return self.by_type.get(event_type, self.untyped)
+
 class ScriptHandler(EventHandler):
     """Handler that executes Python code snippets"""
+    # Static part of every script's globals; per-call names are added in handle()
+    SCRIPT_GLOBALS = {'__builtins__': SCRIPT_BUILTINS}
+    
     def __init__(self, conditions: Dict[str, Any] = None, script: str = ""):
         super().__init__(conditions)
         self.script = script
+        # Parse, validate and compile once here instead of on every event;
+        # optimize=2 drops asserts and docstrings from the bytecode
+        try:
+            tree = ast.parse(script, mode='exec')
+        except SyntaxError as e:
+            raise ScriptValidationError(f"syntax error: {e}") from e
+        validate_script(tree)
+        self.code = compile(tree, f'<ScriptHandler:{id(self)}>', 'exec', optimize=2)
     
     def handle(self, event: GameEvent, game_state: 'GameState') -> str:
         """Execute the script with access to game state"""
         # Create safe execution environment
-        safe_globals = {
-            'event': event,
-            'game_state': game_state,
-            'player': game_state.get_player(event.data.get('player_address')),
-        }
+        safe_globals = dict(self.SCRIPT_GLOBALS,
+                            event=event,
+                            game_state=game_state,
+                            player=game_state.get_player(event.data.get('player_address')))
         
         try:
-            # Execute the script
-            exec(self.script, safe_globals)
+            # Execute the precompiled script
+            exec(self.code, safe_globals)
             return safe_globals.get('response', "Script executed.")
         except Exception as e:
-            print(f"Script execution error: {e}")
+            logger.exception("Script execution error: %s", str(e))
             return "Something mysterious happens..."
 
 # --- Enhanced Game Objects ---
 
 class GameItem:
+    __slots__ = ('name', 'description', 'can_take', 'aliases', 'properties', 'verb_interactions',
+                 'hidden', 'event_handlers', '_lc_names', '_compiled')
+    
     def __init__(self, name: str, description: str, can_take: bool = True, 
                  aliases: List[str] = None, properties: Dict[str, Any] = None,
                  verb_interactions: Dict[str, Dict[str, Any]] = None):
@@ -92,9 +170,20 @@ class GameItem:
         self.verb_interactions = verb_interactions or {}
         self.hidden = False
         self.event_handlers = []
+        self._compiled = {}  # verb -> CompiledInteraction, see get_compiled_interaction
+        self._refresh_match_keys()
+    
+    def _refresh_match_keys(self):
+        """Recompute this item's lowercased name set after changing name or aliases.
+        
+        Only the item itself is updated. Rooms and inventories index items
+        when they are added, so callers must remove the item from any room
+        or inventory holding it and add it back.
+        """
+        self._lc_names = frozenset([self.name.lower()] + [alias.lower() for alias in self.aliases])
     
     def matches(self, text: str) -> bool:
-        return text.lower() in [self.name.lower()] + [alias.lower() for alias in self.aliases]
+        return text.lower() in self._lc_names
     
     def get_property(self, prop_name: str) -> Any:
         return self.properties.get(prop_name)
@@ -102,6 +191,9 @@ class GameItem:
     def set_property(self, prop_name: str, value: Any):
         self.properties[prop_name] = value
     
+    def set_properties(self, properties: Dict[str, Any]):
+        self.properties.update(properties)
+    
     def add_event_handler(self, handler: EventHandler):
         self.event_handlers.append(handler)
     
@@ -112,82 +204,273 @@ class GameItem:
     def get_verb_interaction(self, verb: str) -> Optional[Dict[str, Any]]:
         """Get the interaction definition for a verb"""
         return self.verb_interactions.get(verb.lower())
+    
+    def set_verb_interaction(self, verb: str, interaction: Dict[str, Any]):
+        """Add or replace a verb interaction and drop its prepared copy"""
+        verb = verb.lower()
+        self.verb_interactions[verb] = interaction
+        self._compiled.pop(verb, None)
+    
+    def get_compiled_interaction(self, verb: str) -> Optional['CompiledInteraction']:
+        """Get the prepared interaction for a verb.
+        
+        The cache is keyed on the interaction dict's identity, so interaction
+        dicts must not be edited in place after load. Replace the whole dict,
+        or use set_verb_interaction, to change one.
+        """
+        verb = verb.lower()
+        interaction = self.verb_interactions.get(verb)
+        if not interaction:
+            return None
+        compiled = self._compiled.get(verb)
+        if compiled is None or compiled.source is not interaction:
+            compiled = self._compiled[verb] = CompiledInteraction(interaction)
+        return compiled
+    
+    def compile_interactions(self):
+        """Prepare every dict interaction up front, as the loader does"""
+        for verb, interaction in self.verb_interactions.items():
+            if isinstance(interaction, dict):
+                self.get_compiled_interaction(verb)
+
+def index_item(index: Dict[str, GameItem], item: GameItem):
+    """Add an item's match keys to a lookup index; earlier items keep shared keys"""
+    for key in item._lc_names:
+        index.setdefault(key, item)
+
+def unindex_item(index: Dict[str, GameItem], items: List[GameItem], item: GameItem):
+    """Drop an item's match keys, handing shared keys to the next matching item"""
+    for key in item._lc_names:
+        if index.get(key) is item:
+            del index[key]
+            for other in items:
+                if key in other._lc_names:
+                    index[key] = other
+                    break
+
+def store_item(items: Dict[int, GameItem], index: Dict[str, GameItem], item: GameItem):
+    """Add an item to an identity-keyed item dict and its name index"""
+    items[id(item)] = item
+    index_item(index, item)
+
+def discard_item(items: Dict[int, GameItem], index: Dict[str, GameItem], item: GameItem) -> bool:
+    """Remove an item from an identity-keyed item dict and its name index"""
+    if items.pop(id(item), None) is None:
+        return False
+    unindex_item(index, items.values(), item)
+    return True
+
+def replace_items(items: Dict[int, GameItem], index: Dict[str, GameItem], new_items):
+    """Replace the contents of an item dict and its name index.
+    
+    Keyed by identity for O(1) removal; insertion order is display order.
+    Cleared in place so existing ItemsViews stay live.
+    """
+    new_items = list(new_items)
+    items.clear()
+    index.clear()
+    for item in new_items:
+        store_item(items, index, item)
+
+class ItemsView(Sequence):
+    """Live, read-only view of a room's items or a player's inventory.
+    
+    Change the contents with add_item/remove_item so the name index stays in
+    step; there is deliberately no append or remove here. Concatenating with
+    + gives a plain list. Indexing walks the items, so loop with for rather
+    than by position.
+    """
+    __slots__ = ('_items',)
+    
+    def __init__(self, items: Dict[int, GameItem]):
+        self._items = items
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items.values())
+    
+    def __contains__(self, item) -> bool:
+        return self._items.get(id(item)) is item
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items.values())[index]
+        size = len(self._items)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('ItemsView index out of range')
+        if index == size - 1:
+            return next(reversed(self._items.values()))
+        return next(islice(self._items.values(), index, None))
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ItemsView):
+            other = other._items.values()
+        elif not isinstance(other, (list, tuple)):
+            return NotImplemented
+        return len(self._items) == len(other) and all(a == b for a, b in zip(self._items.values(), other))
+    
+    def __add__(self, other) -> List[GameItem]:
+        return [*self._items.values(), *other]
+    
+    def __radd__(self, other) -> List[GameItem]:
+        return [*other, *self._items.values()]
+    
+    def __repr__(self) -> str:
+        return f"ItemsView({list(self._items.values())!r})"
+
+def exit_desc_direction(prop_name: str) -> Optional[str]:
+    """Direction named by an 'exit_<direction>_desc' property, or None"""
+    if len(prop_name) >= 10 and prop_name.startswith('exit_') and prop_name.endswith('_desc'):
+        return prop_name[5:-5]
+    return None
 
 class GameRoom:
+    __slots__ = ('name', 'description', 'exits', 'properties', 'visited', 'exit_descriptions',
+                 '_handlers_by_type', '_items', '_item_index')
+    # Rooms that have had handlers added and not since cleared, across every
+    # GameState; while zero, trigger_event can skip the room lookup
+    _rooms_with_handlers = 0
+    
     def __init__(self, name: str, description: str, exits: Dict[str, str] = None, 
-                 items: List[GameItem] = None, properties: Dict[str, Any] = None):
+                 items: List[GameItem] = None, properties: Dict[str, Any] = None,
+                 exit_descriptions: Dict[str, str] = None):
         self.name = name
         self.description = description
         self.exits = exits or {}
-        self.items = items or []
+        self._items = {}
+        self._item_index = {}
+        self.items = items or []  # Stored in _items, see the items property
         self.properties = properties or {}
         self.visited = False
-        self.event_handlers = []
+        # Exit descriptions keyed by direction, from 'exit_<direction>_desc' properties
+        self.exit_descriptions = {}
+        for prop_name, value in self.properties.items():
+            direction = exit_desc_direction(prop_name)
+            if direction is not None:
+                self.exit_descriptions[direction] = value
+        if exit_descriptions:
+            self.exit_descriptions.update(exit_descriptions)
+        self._handlers_by_type = HandlerBuckets()
+    
+    @property
+    def event_handlers(self) -> tuple:
+        """Room-scoped handlers; add with add_event_handler or assign a new list"""
+        return tuple(self._handlers_by_type.handlers)
+    
+    @event_handlers.setter
+    def event_handlers(self, handlers: List[EventHandler]):
+        had_handlers = bool(self._handlers_by_type.handlers)
+        self._handlers_by_type = HandlerBuckets(handlers)
+        GameRoom._rooms_with_handlers += bool(self._handlers_by_type.handlers) - had_handlers
+    
+    @property
+    def items(self) -> ItemsView:
+        """Items in the room, in the order they were added"""
+        return ItemsView(self._items)
+    
+    @items.setter
+    def items(self, items: List[GameItem]):
+        replace_items(self._items, self._item_index, items)
     
     def get_item(self, item_name: str) -> Optional[GameItem]:
-        for item in self.items:
-            if item.matches(item_name):
-                return item
-        return None
+        return self._item_index.get(item_name.lower())
     
     def remove_item(self, item: GameItem) -> bool:
-        if item in self.items:
-            self.items.remove(item)
-            return True
-        return False
+        return discard_item(self._items, self._item_index, item)
     
     def add_item(self, item: GameItem):
-        self.items.append(item)
+        store_item(self._items, self._item_index, item)
     
     def get_property(self, prop_name: str) -> Any:
         return self.properties.get(prop_name)
     
     def set_property(self, prop_name: str, value: Any):
         self.properties[prop_name] = value
+        direction = exit_desc_direction(prop_name)
+        if direction is not None:
+            self.exit_descriptions[direction] = value
     
     def add_event_handler(self, handler: EventHandler):
-        self.event_handlers.append(handler)
+        if not self._handlers_by_type.handlers:
+            GameRoom._rooms_with_handlers += 1
+        self._handlers_by_type.add(handler)
     
     def get_exit_description(self, direction: str) -> Optional[str]:
         """Get custom description for an exit"""
-        return self.properties.get(f'exit_{direction}_desc')
+        description = self.exit_descriptions.get(direction)
+        if description is None and self.properties:
+            # Scripts may write the property without going through set_property
+            description = self.properties.get(f'exit_{direction}_desc')
+        return description
 
 class Player:
-    def __init__(self, address: str):
+    __slots__ = ('address', 'max_inventory', 'score', 'moves', 'properties',
+                 '_rooms', '_current_room', '_room_obj', '_inventory', '_item_index')
+    
+    def __init__(self, address: str, rooms: Dict[str, 'GameRoom'] = None):
         self.address = address
+        self._rooms = rooms if rooms is not None else {}
         self.current_room = 'entrance_hall'
-        self.inventory = []
+        self._inventory = {}
+        self._item_index = {}
+        self.inventory = []  # Stored in _inventory, see the inventory property
         self.max_inventory = 10
         self.score = 0
         self.moves = 0
         self.properties = {}  # Custom player properties
     
+    @property
+    def current_room(self) -> str:
+        return self._current_room
+    
+    @current_room.setter
+    def current_room(self, room_id: str):
+        self._current_room = room_id
+        self._room_obj = self._rooms.get(room_id)
+    
+    @property
+    def room(self) -> Optional['GameRoom']:
+        """The GameRoom for current_room, resolved once per move"""
+        if self._room_obj is None:
+            self._room_obj = self._rooms.get(self._current_room)
+        return self._room_obj
+    
+    @property
+    def inventory(self) -> ItemsView:
+        """Carried items, in the order they were picked up"""
+        return ItemsView(self._inventory)
+    
+    @inventory.setter
+    def inventory(self, items: List[GameItem]):
+        replace_items(self._inventory, self._item_index, items)
+    
     def get_item(self, item_name: str) -> Optional[GameItem]:
-        for item in self.inventory:
-            if item.matches(item_name):
-                return item
-        return None
+        return self._item_index.get(item_name.lower())
     
     def has_item(self, item_name: str) -> bool:
         return self.get_item(item_name) is not None
     
     def add_item(self, item: GameItem) -> bool:
-        if len(self.inventory) < self.max_inventory:
-            self.inventory.append(item)
+        if len(self._inventory) < self.max_inventory:
+            store_item(self._inventory, self._item_index, item)
             return True
         return False
     
     def remove_item(self, item: GameItem) -> bool:
-        if item in self.inventory:
-            self.inventory.remove(item)
-            return True
-        return False
+        return discard_item(self._inventory, self._item_index, item)
     
     def get_property(self, prop_name: str) -> Any:
         return self.properties.get(prop_name)
     
     def set_property(self, prop_name: str, value: Any):
         self.properties[prop_name] = value
+    
+    def set_properties(self, properties: Dict[str, Any]):
+        self.properties.update(properties)
 
 # --- Game State Management ---
 
@@ -197,12 +480,13 @@ class GameState:
         self.rooms = {}
         self.items = {}
         self.global_flags = {}  # Global game state flags
-        self.event_handlers = []  # Global event handlers
+        self._handlers_by_type = HandlerBuckets()  # Global event handlers
         self.starting_room = 'entrance_hall'  # Default starting room
+        self.script_errors = []  # Event scripts rejected while loading
     
     def get_player(self, address: str) -> Optional[Player]:
         if address not in self.players:
-            player = Player(address)
+            player = Player(address, self.rooms)
             player.current_room = self.starting_room  # Use configured starting room
             self.players[address] = player
             self.trigger_event(GameEvent('player_joined', {'player_address': address}))
@@ -225,105 +509,211 @@ class GameState:
                 'new_value': value
             }))
     
+    def set_flags(self, flags: Dict[str, Any]):
+        """Set several global flags at once"""
+        # flag_changed events carry no player, so only global handlers can see
+        # them; with none registered a single dict.update is equivalent
+        if self._handlers_by_type.get('flag_changed'):
+            for flag_name, value in flags.items():
+                self.set_flag(flag_name, value)
+        else:
+            self.global_flags.update(flags)
+    
     def get_flag(self, flag_name: str) -> Any:
         """Get a global game flag"""
         return self.global_flags.get(flag_name, False)
     
+    @property
+    def event_handlers(self) -> tuple:
+        """Global handlers; add with add_event_handler or assign a new list"""
+        return tuple(self._handlers_by_type.handlers)
+    
+    @event_handlers.setter
+    def event_handlers(self, handlers: List[EventHandler]):
+        self._handlers_by_type = HandlerBuckets(handlers)
+    
     def add_event_handler(self, handler: EventHandler):
         """Add a global event handler"""
-        self.event_handlers.append(handler)
+        self._handlers_by_type.add(handler)
+    
+    def add_room_event_handler(self, room_id: str, handler: EventHandler) -> bool:
+        """Add an event handler scoped to a room"""
+        room = self.rooms.get(room_id)
+        if room is None:
+            return False
+        room.add_event_handler(handler)
+        return True
     
     def trigger_event(self, event: GameEvent) -> List[str]:
         """Trigger an event and return all responses"""
+        global_handlers = self._handlers_by_type.get(event.event_type)
+        # Nothing can respond: skip the player and room lookup
+        if not global_handlers and not GameRoom._rooms_with_handlers:
+            return []
+        
         responses = []
+        append = responses.append
         
-        # Check global handlers
-        for handler in self.event_handlers:
+        # Global handlers first, then the handlers of the player's room
+        for handler in chain(global_handlers, self._room_handlers(event)):
             if handler.can_handle(event, self):
                 response = handler.handle(event, self)
                 if response:
-                    responses.append(response)
+                    append(response)
         
-        # Check room handlers
+        return responses
+    
+    def _room_handlers(self, event: GameEvent):
+        """Yield room-scoped handlers for an event's player.
+        
+        A generator so the room is resolved only after the global handlers
+        have run, since those may move the player.
+        """
         if 'player_address' in event.data:
             player = self.get_player(event.data['player_address'])
             if player:
-                room = self.get_room(player.current_room)
+                room = player.room
                 if room:
-                    for handler in room.event_handlers:
-                        if handler.can_handle(event, self):
-                            response = handler.handle(event, self)
-                            if response:
-                                responses.append(response)
-        
-        return responses
+                    yield from room._handlers_by_type.get(event.event_type)
 
 # --- Game Definition System ---
 
+class _Vars(dict):
+    """format_map namespace that leaves unknown {names} in the text untouched"""
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+def is_simple_template(template: str) -> bool:
+    """True if format_map renders the template exactly like plain {name} replacement"""
+    if '{{' in template or '}}' in template:
+        return False
+    try:
+        fields = list(string.Formatter().parse(template))
+    except ValueError:
+        return False
+    return all(field_name is None or (field_name.isidentifier() and conversion is None and not format_spec)
+               for _, field_name, format_spec, conversion in fields)
+
+class CompiledInteraction:
+    """A verb interaction dict prepared once for process_verb_interaction.
+    
+    Requirements are split into (check, value) pairs. Simple response
+    templates are rendered with str.format_map; anything format_map would
+    read differently (braces escapes, format specs, attribute access) keeps
+    the plain str.replace substitution. The source dict
+    is treated as immutable; see GameItem.get_compiled_interaction.
+    """
+    __slots__ = ('source', 'requires', 'effects', 'response_template', 'response',
+                 'failure_response')
+    
+    def __init__(self, interaction: Dict[str, Any]):
+        self.source = interaction
+        # None rather than empty, so the common no-requirement/no-effect
+        # interactions skip those steps with a single identity test
+        self.requires = compile_requirements(interaction.get('requires', [])) or None
+        self.effects = interaction.get('effects', {}) or None
+        self.failure_response = interaction.get('failure_response')
+        self.response = interaction.get('response')
+        self.response_template = None
+        if isinstance(self.response, str) and is_simple_template(self.response):
+            self.response_template = self.response
+
+def intern_keys(mapping: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a dict loaded from JSON with its string keys interned"""
+    return {sys.intern(key): value for key, value in mapping.items()}
+
+def intern_interactions(verb_interactions: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern verb names plus each interaction's keys, effect types and requirements"""
+    interned = {}
+    for verb, interaction in verb_interactions.items():
+        if isinstance(interaction, dict):
+            interaction = intern_keys(interaction)
+            if isinstance(interaction.get('effects'), dict):
+                interaction['effects'] = intern_keys(interaction['effects'])
+            if isinstance(interaction.get('requires'), list):
+                interaction['requires'] = [sys.intern(requirement) if isinstance(requirement, str) else requirement
+                                           for requirement in interaction['requires']]
+        interned[sys.intern(verb)] = interaction
+    return interned
+
 class GameBuilder:
     """Build games from configuration data"""
     
     @staticmethod
     def load_from_json(filename: str) -> GameState:
         """Load a game from JSON configuration"""
-        with open(filename, 'r') as f:
-            config = json.load(f)
+        if orjson is not None:
+            config = orjson.loads(Path(filename).read_bytes())
+        else:
+            with open(filename, 'r') as f:
+                config = json.load(f)
         
         game_state = GameState()
         
+        # Skip comment fields
+        items_cfg = {item_id: item_data for item_id, item_data in config.get('items', {}).items()
+                     if not item_id.startswith('_')}
+        rooms_cfg = {room_id: room_data for room_id, room_data in config.get('rooms', {}).items()
+                     if not room_id.startswith('_')}
+        
         # Load items
-        for item_id, item_data in config.get('items', {}).items():
-            # Skip comment fields
-            if item_id.startswith('_'):
-                continue
-            
+        for item_id, item_data in items_cfg.items():
+            # IDs, names and keys are interned so repeated comparisons and
+            # dict lookups on them hit CPython's identity fast path
             item = GameItem(
-                name=item_data['name'],
+                name=sys.intern(item_data['name']),
                 description=item_data['description'],
                 can_take=item_data.get('can_take', True),
-                aliases=item_data.get('aliases', []),
-                properties=item_data.get('properties', {}),
-                verb_interactions=item_data.get('verb_interactions', {})
+                aliases=[sys.intern(alias) for alias in item_data.get('aliases', [])],
+                properties=intern_keys(item_data.get('properties', {})),
+                verb_interactions=intern_interactions(item_data.get('verb_interactions', {}))
             )
-            game_state.items[item_id] = item
+            item.compile_interactions()
+            game_state.items[sys.intern(item_id)] = item
         
         # Load rooms
-        for room_id, room_data in config.get('rooms', {}).items():
-            # Skip comment fields
-            if room_id.startswith('_'):
-                continue
-                
+        for room_id, room_data in rooms_cfg.items():
             # Get items for this room
             room_items = []
             for item_id in room_data.get('items', []):
                 if item_id in game_state.items:
                     room_items.append(game_state.items[item_id])
             
+            exits = {sys.intern(direction): sys.intern(to_room)
+                     for direction, to_room in room_data.get('exits', {}).items()}
             room = GameRoom(
-                name=room_data['name'],
+                name=sys.intern(room_data['name']),
                 description=room_data['description'],
-                exits=room_data.get('exits', {}),
+                exits=exits,
                 items=room_items,
-                properties=room_data.get('properties', {})
+                properties=intern_keys(room_data.get('properties', {})),
+                exit_descriptions=intern_keys(room_data.get('exit_descriptions', {}))
             )
-            game_state.rooms[room_id] = room
+            game_state.rooms[sys.intern(room_id)] = room
         
         # Load event handlers
-        for handler_data in config.get('event_handlers', []):
+        for index, handler_data in enumerate(config.get('event_handlers', [])):
             if handler_data['type'] == 'script':
-                handler = ScriptHandler(
-                    conditions=handler_data.get('conditions', {}),
-                    script=handler_data['script']
-                )
+                conditions = {sys.intern(key): sys.intern(value) if isinstance(value, str) else value
+                              for key, value in handler_data.get('conditions', {}).items()}
+                scope = handler_data.get('scope', 'global')
+                try:
+                    handler = ScriptHandler(
+                        conditions=conditions,
+                        script=handler_data['script']
+                    )
+                except ScriptValidationError as e:
+                    # Skip the handler now rather than failing on its first event
+                    error = f"event_handlers[{index}] ({scope}): {e}"
+                    game_state.script_errors.append(error)
+                    continue
                 
                 # Add to appropriate scope
-                scope = handler_data.get('scope', 'global')
                 if scope == 'global':
                     game_state.add_event_handler(handler)
                 elif scope.startswith('room:'):
                     room_id = scope.split(':', 1)[1]
-                    if room_id in game_state.rooms:
-                        game_state.rooms[room_id].add_event_handler(handler)
+                    game_state.add_room_event_handler(room_id, handler)
                 elif scope.startswith('item:'):
                     item_id = scope.split(':', 1)[1]
                     if item_id in game_state.items:
@@ -331,7 +721,7 @@ class GameBuilder:
         
         # Set initial flags
         for flag_name, flag_value in config.get('initial_flags', {}).items():
-            game_state.set_flag(flag_name, flag_value)
+            game_state.set_flag(sys.intern(flag_name), flag_value)
         
         # Find and set the starting room
         starting_room = None
@@ -352,6 +742,52 @@ class GameBuilder:
 
 # --- Enhanced Command System ---
 
+def _check_flag(engine: 'GameEngine', player: Player, flag_name: str) -> Any:
+    return engine.game_state.get_flag(flag_name)
+
+def _check_item(engine: 'GameEngine', player: Player, item_name: str) -> bool:
+    return player.has_item(item_name)
+
+def _check_in_room(engine: 'GameEngine', player: Player, room_id: str) -> bool:
+    return player.current_room == room_id
+
+def _check_property(engine: 'GameEngine', player: Player, prop_check: str) -> bool:
+    """'property:name' is truthy, 'property:name=value' compares as a string"""
+    prop_name, sep, prop_value = prop_check.partition('=')
+    if sep:
+        return player.get_property(prop_name) == prop_value
+    return bool(player.get_property(prop_name))
+
+# Requirement prefix -> check(engine, player, value), used by check_requirement
+# and compile_requirements
+_REQ_HANDLERS = {
+    'flag': _check_flag,
+    'item': _check_item,
+    'in_room': _check_in_room,
+    'property': _check_property,
+}
+
+def compile_requirements(requirements: List[str]) -> tuple:
+    """Split requirement strings into (check, value) pairs for check_requirement's rules.
+    
+    Values are interned, so an in_room payload and the interned room ID in
+    player.current_room compare by identity. Anything that is not a string
+    is left to check_requirement itself.
+    """
+    compiled = []
+    for requirement in requirements or ():
+        if not isinstance(requirement, str):
+            compiled.append((GameEngine.check_requirement, requirement))
+            continue
+        prefix, sep, value = requirement.partition(':')
+        handler = _REQ_HANDLERS.get(prefix) if sep else None
+        if handler is None:
+            # Simple flag check
+            compiled.append((_check_flag, requirement))
+        else:
+            compiled.append((handler, sys.intern(value)))
+    return tuple(compiled)
+
 class GameEngine:
     def __init__(self, game_state: GameState):
         self.game_state = game_state
@@ -381,25 +817,31 @@ class GameEngine:
         }
         
         # All verbs that can be used on objects (excluding movement commands)
-        self.object_verbs = []
-        for category in self.verb_categories.values():
-            self.object_verbs.extend(category)
+        self.object_verbs = frozenset(verb for category in self.verb_categories.values() for verb in category)
+        
+        # Single dispatch table: built-in commands first, then verb-object handlers
+        self._dispatch = dict(self.commands)
+        for verb in self.object_verbs:
+            self._dispatch.setdefault(verb, partial(self.cmd_verb_object, verb=verb))
         
         # Common prepositions to strip from commands for natural language
-        self.prepositions = {
+        self.prepositions = frozenset({
             'at', 'to', 'on', 'in', 'into', 'from', 'with', 'against', 'upon', 
             'onto', 'under', 'over', 'through', 'around', 'behind', 'beside',
             'near', 'by', 'across', 'along', 'above', 'below', 'within'
-        }
+        })
+        # Matches a preposition only when it is a whole whitespace-separated word
+        self._prep_re = re.compile(
+            r'(?<!\S)(?:' + '|'.join(map(re.escape, sorted(self.prepositions, key=len, reverse=True))) + r')(?!\S)')
     
     def parse_command_with_prepositions(self, command_text: str) -> tuple:
         """Parse a command, removing prepositions for natural language support"""
-        parts = command_text.lower().split()
+        parts = command_text.lower().split(None, 1)
         if not parts:
             return None, []
         
         verb = parts[0]
-        remaining_words = parts[1:]
+        tail = parts[1] if len(parts) > 1 else ''
         
         # Handle special verb+preposition combinations that should be preserved
         special_combinations = {
@@ -413,21 +855,18 @@ class GameEngine:
         }
         
         # For certain verbs, preserve meaningful prepositions
-        if verb in special_combinations and len(remaining_words) >= 2:
-            # Check if there's a meaningful preposition to preserve context
-            for i, word in enumerate(remaining_words):
-                if word in special_combinations[verb]:
-                    # Keep structure: verb + object1 + preposition + object2
-                    # e.g., "put key in chest" -> verb="put", args=["key", "in", "chest"]
-                    return verb, remaining_words
+        if verb in special_combinations:
+            remaining_words = tail.split()
+            if len(remaining_words) >= 2:
+                # Check if there's a meaningful preposition to preserve context
+                for i, word in enumerate(remaining_words):
+                    if word in special_combinations[verb]:
+                        # Keep structure: verb + object1 + preposition + object2
+                        # e.g., "put key in chest" -> verb="put", args=["key", "in", "chest"]
+                        return verb, remaining_words
         
         # For most cases, just remove prepositions for cleaner parsing
-        filtered_words = []
-        for word in remaining_words:
-            if word not in self.prepositions:
-                filtered_words.append(word)
-        
-        return verb, filtered_words
+        return verb, self._prep_re.sub(' ', tail).split()
     
     def process_command(self, player_address: str, command_text: str) -> str:
         """Process a command and return the response"""
@@ -451,48 +890,54 @@ class GameEngine:
         })
         event_responses = self.game_state.trigger_event(event)
         
-        # Process command
-        if verb in self.commands:
-            try:
-                command_response = self.commands[verb](player, args)
-            except Exception as e:
-                command_response = f"Error processing command: {e}"
-                print(f"Command error: {e}")
-        elif verb in self.object_verbs:
-            # Handle verb-object interactions
+        # Process command (built-in commands and verb-object interactions);
+        # the argument text is joined once here for every handler
+        handler = self._dispatch.get(verb)
+        if handler is None:
+            command_response = unknown_verb_reply(verb)
+        else:
+            target_name = ' '.join(args)
             try:
-                command_response = self.cmd_verb_object(player, verb, args)
+                command_response = handler(player, args, target_name)
             except Exception as e:
-                command_response = f"Error processing verb command: {e}"
-                print(f"Verb command error: {e}")
-        else:
-            command_response = f"I don't understand '{verb}'. Type 'help' for available commands."
+                if verb in self.commands:
+                    command_response = f"Error processing command: {e}"
+                    logger.exception("Command error: %s", str(e))
+                else:
+                    command_response = f"Error processing verb command: {e}"
+                    logger.exception("Verb command error: %s", str(e))
         
-        # Combine responses
-        all_responses = event_responses + [command_response]
-        return '\n\n'.join(filter(None, all_responses))
+        # Combine responses; trigger_event already drops empty ones
+        if command_response:
+            event_responses.append(command_response)
+        return '\n\n'.join(event_responses)
     
-    def cmd_look(self, player: Player, args: List[str]) -> str:
+    def cmd_look(self, player: Player, args: List[str], target_name: str) -> str:
         """Look around or examine something"""
-        print(f"DEBUG: Player {player.address[:8]} trying to look in room '{player.current_room}'")
-        current_room = self.game_state.get_room(player.current_room)
-        print(f"DEBUG: Found room: {current_room.name if current_room else 'None'}")
+        logger.debug("Player %s trying to look in room '%s'", player.address[:8], player.current_room)
+        current_room = player.room
+        logger.debug("Found room: %s", current_room.name if current_room else None)
         
         if not args:
-            # Look around the room
-            response = f"{current_room.name}\n{current_room.description}"
+            # Look around the room; lines are collected and joined once
+            parts = [current_room.name, current_room.description]
             
             # List visible items
-            if current_room.items:
-                visible_items = [item for item in current_room.items if not item.hidden]
+            if current_room._items:
+                visible_items = [item for item in current_room._items.values() if not item.hidden]
                 if visible_items:
-                    response += "\n\nYou can see:"
-                    for item in visible_items:
-                        response += f"\n  {item.name}"
+                    parts.append("\nYou can see:")
+                    parts.extend([f"  {item.name}" for item in visible_items])
             
             # List exits with custom descriptions
             if current_room.exits:
-                response += f"\n\nExits: {', '.join(current_room.exits.keys())}"
+                parts.append(f"\nExits: {', '.join(current_room.exits)}")
+                for direction in current_room.exits:
+                    exit_description = current_room.get_exit_description(direction)
+                    if exit_description:
+                        parts.append(f"  {direction}: {exit_description}")
+            
+            response = '\n'.join(parts)
             
             current_room.visited = True
             
@@ -505,13 +950,11 @@ class GameEngine:
             return response
         else:
             # Look at specific item
-            item_name = ' '.join(args)
-            
             # Check room first
-            item = current_room.get_item(item_name)
+            item = current_room.get_item(target_name)
             if not item:
                 # Check inventory
-                item = player.get_item(item_name)
+                item = player.get_item(target_name)
             
             if item:
                 # Trigger examine event
@@ -522,24 +965,23 @@ class GameEngine:
                 }))
                 return item.description
             else:
-                return f"You don't see any '{item_name}' here."
+                return f"You don't see any '{target_name}' here."
     
-    def cmd_take(self, player: Player, args: List[str]) -> str:
+    def cmd_take(self, player: Player, args: List[str], target_name: str) -> str:
         """Take an item"""
         if not args:
             return "Take what?"
         
-        item_name = ' '.join(args)
-        current_room = self.game_state.get_room(player.current_room)
-        item = current_room.get_item(item_name)
+        current_room = player.room
+        item = current_room.get_item(target_name)
         
         if not item:
-            return f"There is no '{item_name}' here."
+            return f"There is no '{target_name}' here."
         
         if not item.can_take:
             return f"You can't take the {item.name}."
         
-        if len(player.inventory) >= player.max_inventory:
+        if len(player._inventory) >= player.max_inventory:
             return "Your inventory is full!"
         
         current_room.remove_item(item)
@@ -555,20 +997,16 @@ class GameEngine:
         
         return f"Taken: {item.name}."
     
-    def cmd_use(self, player: Player, args: List[str]) -> str:
+    def cmd_use(self, player: Player, args: List[str], target_name: str) -> str:
         """Use an item"""
         if not args:
             return "Use what?"
         
         # Parse "use X on Y" or "use X with Y"
-        args_text = ' '.join(args)
-        if ' on ' in args_text:
-            item1_name, item2_name = args_text.split(' on ', 1)
-        elif ' with ' in args_text:
-            item1_name, item2_name = args_text.split(' with ', 1)
-        else:
-            item1_name = args_text
-            item2_name = None
+        head, sep, tail = target_name.partition(' on ')
+        if not sep:
+            head, sep, tail = target_name.partition(' with ')
+        item1_name, item2_name = (head, tail) if sep else (target_name, None)
         
         # Find the first item (should be in inventory)
         item1 = player.get_item(item1_name.strip())
@@ -584,7 +1022,7 @@ class GameEngine:
         
         if item2_name:
             # Find second item (room or inventory)
-            current_room = self.game_state.get_room(player.current_room)
+            current_room = player.room
             item2 = current_room.get_item(item2_name.strip())
             if not item2:
                 item2 = player.get_item(item2_name.strip())
@@ -607,13 +1045,12 @@ class GameEngine:
     
     # ... (other command methods remain similar but with event triggers)
     
-    def cmd_unlock(self, player: Player, args: List[str]) -> str:
+    def cmd_unlock(self, player: Player, args: List[str], target_name: str) -> str:
         """Unlock something"""
         if not args:
             return "Unlock what?"
         
-        target_name = ' '.join(args)
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         target = current_room.get_item(target_name)
         
         if not target:
@@ -631,13 +1068,13 @@ class GameEngine:
         else:
             return f"You can't unlock the {target.name}."
     
-    def cmd_go(self, player: Player, args: List[str]) -> str:
+    def cmd_go(self, player: Player, args: List[str], target_name: str) -> str:
         """Move to another room"""
         if not args:
             return "Go where?"
         
         direction = args[0].lower()
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         
         # Check if movement is blocked by events
         movement_event = GameEvent('attempt_move', {
@@ -670,7 +1107,7 @@ class GameEngine:
         }))
         
         # Automatically look around the new room
-        look_response = self.cmd_look(player, [])
+        look_response = self.cmd_look(player, [], '')
         
         # Add any event responses
         if event_responses:
@@ -678,24 +1115,22 @@ class GameEngine:
         else:
             return look_response
     
-    def cmd_inventory(self, player: Player, args: List[str]) -> str:
-        if not player.inventory:
+    def cmd_inventory(self, player: Player, args: List[str], target_name: str) -> str:
+        if not player._inventory:
             return "You are carrying nothing."
         
-        response = "You are carrying:"
-        for item in player.inventory:
-            response += f"\n  {item.name}"
-        return response
+        parts = ["You are carrying:"]
+        parts.extend([f"  {item.name}" for item in player._inventory.values()])
+        return '\n'.join(parts)
     
-    def cmd_examine(self, player: Player, args: List[str]) -> str:
-        return self.cmd_look(player, args)
+    def cmd_examine(self, player: Player, args: List[str], target_name: str) -> str:
+        return self.cmd_look(player, args, target_name)
     
-    def cmd_open(self, player: Player, args: List[str]) -> str:
+    def cmd_open(self, player: Player, args: List[str], target_name: str) -> str:
         if not args:
             return "Open what?"
         
-        target_name = ' '.join(args)
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         target = current_room.get_item(target_name)
         
         if not target:
@@ -712,12 +1147,11 @@ class GameEngine:
         else:
             return f"You can't open the {target.name}."
     
-    def cmd_close(self, player: Player, args: List[str]) -> str:
+    def cmd_close(self, player: Player, args: List[str], target_name: str) -> str:
         if not args:
             return "Close what?"
         
-        target_name = ' '.join(args)
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         target = current_room.get_item(target_name)
         
         if not target:
@@ -734,10 +1168,10 @@ class GameEngine:
         else:
             return f"You can't close the {target.name}."
     
-    def cmd_score(self, player: Player, args: List[str]) -> str:
-        return f"Score: {player.score} points\nMoves: {player.moves}\nItems carried: {len(player.inventory)}/{player.max_inventory}"
+    def cmd_score(self, player: Player, args: List[str], target_name: str) -> str:
+        return f"Score: {player.score} points\nMoves: {player.moves}\nItems carried: {len(player._inventory)}/{player.max_inventory}"
     
-    def cmd_help(self, player: Player, args: List[str]) -> str:
+    def cmd_help(self, player: Player, args: List[str], target_name: str) -> str:
         return """Available commands:
 look [at item] - Look around or examine an item
 take <item> - Take an item  
@@ -763,20 +1197,19 @@ cast, enchant
 
 Abbreviations: l (look), t (take), d (drop), i (inventory), x (examine), u (use)"""
     
-    def cmd_quit(self, player: Player, args: List[str]) -> str:
+    def cmd_quit(self, player: Player, args: List[str], target_name: str) -> str:
         return f"Thanks for playing! Final score: {player.score} points in {player.moves} moves."
     
-    def cmd_drop(self, player: Player, args: List[str]) -> str:
+    def cmd_drop(self, player: Player, args: List[str], target_name: str) -> str:
         if not args:
             return "Drop what?"
         
-        item_name = ' '.join(args)
-        item = player.get_item(item_name)
+        item = player.get_item(target_name)
         
         if not item:
-            return f"You don't have any '{item_name}'."
+            return f"You don't have any '{target_name}'."
         
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         player.remove_item(item)
         current_room.add_item(item)
         
@@ -789,15 +1222,13 @@ Abbreviations: l (look), t (take), d (drop), i (inventory), x (examine), u (use)
         
         return f"Dropped: {item.name}."
     
-    def cmd_verb_object(self, player: Player, verb: str, args: List[str]) -> str:
+    def cmd_verb_object(self, player: Player, args: List[str], target_name: str, verb: str) -> str:
         """Handle verb-object interactions"""
         if not args:
             return f"{verb.capitalize()} what?"
         
-        target_name = ' '.join(args)
-        
         # Find target in room or inventory
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = player.room
         target = current_room.get_item(target_name)
         location = 'room'
         
@@ -815,22 +1246,28 @@ Abbreviations: l (look), t (take), d (drop), i (inventory), x (examine), u (use)
     
     def process_verb_interaction(self, player: Player, target: 'GameItem', verb: str, location: str) -> str:
         """Process a verb interaction with an item"""
-        interaction = target.get_verb_interaction(verb)
-        if not interaction:
+        interaction = target.get_compiled_interaction(verb)
+        if interaction is None:
             return f"You can't {verb} the {target.name}."
         
         # Check requirements
-        requirements = interaction.get('requires', [])
-        for requirement in requirements:
-            if not self.check_requirement(player, requirement):
-                return interaction.get('failure_response', f"You can't {verb} the {target.name} right now.")
+        if interaction.requires is not None:
+            for check, value in interaction.requires:
+                if not check(self, player, value):
+                    if interaction.failure_response is not None:
+                        return interaction.failure_response
+                    return f"You can't {verb} the {target.name} right now."
         
         # Apply effects
-        effects = interaction.get('effects', {})
-        self.apply_verb_effects(player, target, effects, location)
-        
-        # Get response with variable substitution
-        response = interaction.get('response', f"You {verb} the {target.name}.")
+        if interaction.effects is not None:
+            self.apply_verb_effects(player, target, interaction.effects, location)
+        
+        # Get response with variable substitution, prepared at load time
+        if interaction.response_template is not None:
+            return interaction.response_template.format_map(_Vars(item_name=target.name, player_name='you'))
+        response = interaction.response
+        if response is None:
+            response = f"You {verb} the {target.name}."
         response = response.replace('{item_name}', target.name)
         response = response.replace('{player_name}', 'you')
         
@@ -838,71 +1275,89 @@ Abbreviations: l (look), t (take), d (drop), i (inventory), x (examine), u (use)
     
     def check_requirement(self, player: Player, requirement: str) -> bool:
         """Check if a requirement is met"""
-        if requirement.startswith('flag:'):
-            flag_name = requirement[5:]
-            return self.game_state.get_flag(flag_name)
-        elif requirement.startswith('item:'):
-            item_name = requirement[5:]
-            return player.has_item(item_name)
-        elif requirement.startswith('in_room:'):
-            room_id = requirement[8:]
-            return player.current_room == room_id
-        elif requirement.startswith('property:'):
-            prop_check = requirement[9:]
-            if '=' in prop_check:
-                prop_name, prop_value = prop_check.split('=', 1)
-                return player.get_property(prop_name) == prop_value
-            else:
-                return bool(player.get_property(prop_check))
-        else:
-            # Simple flag check
-            return self.game_state.get_flag(requirement)
+        prefix, sep, value = requirement.partition(':')
+        if sep:
+            handler = _REQ_HANDLERS.get(prefix)
+            if handler is not None:
+                return handler(self, player, value)
+        # Simple flag check
+        return self.game_state.get_flag(requirement)
     
     def apply_verb_effects(self, player: Player, target: 'GameItem', effects: Dict[str, Any], location: str):
         """Apply the effects of a verb interaction"""
-        current_room = self.game_state.get_room(player.current_room)
+        current_room = None
+        
+        def room() -> GameRoom:
+            # Resolved on first use only; the cached room stays valid for the
+            # whole interaction (teleport_to pins it before moving the player)
+            nonlocal current_room
+            if current_room is None:
+                current_room = player.room
+            return current_room
         
         for effect_type, effect_value in effects.items():
-            if effect_type == 'score':
-                player.score += effect_value
-            elif effect_type == 'remove_item':
-                if effect_value and location == 'inventory':
-                    player.remove_item(target)
-                elif effect_value and location == 'room':
-                    current_room.remove_item(target)
-            elif effect_type == 'move_item_to_room':
-                if effect_value and location == 'inventory':
-                    player.remove_item(target)
-                    current_room.add_item(target)
-            elif effect_type == 'add_room_exit':
-                if isinstance(effect_value, dict):
-                    direction = effect_value.get('direction')
-                    to_room = effect_value.get('to_room')
-                    if direction and to_room:
-                        current_room.exits[direction] = to_room
-            elif effect_type == 'set_flag':
-                if isinstance(effect_value, dict):
-                    for flag_name, flag_value in effect_value.items():
-                        self.game_state.set_flag(flag_name, flag_value)
-                else:
-                    self.game_state.set_flag(effect_value, True)
-            elif effect_type == 'set_player_property':
-                if isinstance(effect_value, dict):
-                    for prop_name, prop_value in effect_value.items():
-                        player.set_property(prop_name, prop_value)
-            elif effect_type == 'set_item_property':
-                if isinstance(effect_value, dict):
-                    for prop_name, prop_value in effect_value.items():
-                        target.set_property(prop_name, prop_value)
-            elif effect_type == 'teleport_to':
-                if isinstance(effect_value, str) and effect_value in self.game_state.rooms:
-                    player.current_room = effect_value
+            handler = self._EFFECT_HANDLERS.get(effect_type)
+            if handler is not None:
+                handler(self, player, target, effect_value, location, room)
+    
+    def _eff_score(self, player, target, value, location, room):
+        player.score += value
+    
+    def _eff_remove_item(self, player, target, value, location, room):
+        if value and location == 'inventory':
+            player.remove_item(target)
+        elif value and location == 'room':
+            room().remove_item(target)
+    
+    def _eff_move_item_to_room(self, player, target, value, location, room):
+        if value and location == 'inventory':
+            player.remove_item(target)
+            room().add_item(target)
+    
+    def _eff_add_room_exit(self, player, target, value, location, room):
+        if isinstance(value, dict):
+            direction = value.get('direction')
+            to_room = value.get('to_room')
+            if direction and to_room:
+                room().exits[direction] = to_room
+    
+    def _eff_set_flag(self, player, target, value, location, room):
+        if isinstance(value, dict):
+            self.game_state.set_flags(value)
+        else:
+            self.game_state.set_flag(value, True)
+    
+    def _eff_set_player_property(self, player, target, value, location, room):
+        if isinstance(value, dict):
+            player.set_properties(value)
+    
+    def _eff_set_item_property(self, player, target, value, location, room):
+        if isinstance(value, dict):
+            target.set_properties(value)
+    
+    def _eff_teleport_to(self, player, target, value, location, room):
+        if isinstance(value, str) and value in self.game_state.rooms:
+            room()  # Later effects still act on the room the interaction happened in
+            player.current_room = value
+    
+    # Effect type -> handler(self, player, target, value, location, room), where
+    # room() lazily returns the room the interaction happened in
+    _EFFECT_HANDLERS = {
+        'score': _eff_score,
+        'remove_item': _eff_remove_item,
+        'move_item_to_room': _eff_move_item_to_room,
+        'add_room_exit': _eff_add_room_exit,
+        'set_flag': _eff_set_flag,
+        'set_player_property': _eff_set_player_property,
+        'set_item_property': _eff_set_item_property,
+        'teleport_to': _eff_teleport_to,
+    }
 
 # --- LXMF Integration ---
 
 # Initialize game
 import os
-import sys
+import signal
 import argparse
 
 def load_game_config():
@@ -938,6 +1393,14 @@ def load_game_config():
         print(f"Successfully loaded game from {config_name}")
         print(f"Loaded {len(game_state.rooms)} rooms: {list(game_state.rooms.keys())}")
         print(f"Loaded {len(game_state.items)} items: {list(game_state.items.keys())}")
+        for error in game_state.script_errors:
+            print(f"Skipped invalid event script {error}")
+        for room_id, direction, target in dangling_exits(game_state):
+            print(f"Warning: exit '{direction}' in room '{room_id}' leads to unknown room '{target}'")
+        unreachable = unreachable_rooms(game_state)
+        if unreachable:
+            print(f"Warning: no exit or verb effect leads from '{game_state.starting_room}' to rooms "
+                  f"{unreachable} (event scripts may still open a way in)")
         return game_state, config_name
     except FileNotFoundError:
         print(f"Config file '{config_path}' not found, creating default game...")
@@ -971,40 +1434,38 @@ game_state, config_name = load_game_config()
 game_engine = GameEngine(game_state)
 
 # LXMF setup (same as before)
-RNS.Reticulum()
 APP_NAME = "zork_scriptable"
+identity, destination, router, lxmf_destination = boot(APP_NAME, "zork_server_identity")
 
-identity_file = "zork_server_identity"
-if RNS.Identity.from_file(identity_file):
-    identity = RNS.Identity.from_file(identity_file)
-    print(f"Loaded existing identity from {identity_file}")
-else:
-    identity = RNS.Identity()
-    identity.to_file(identity_file)
-    print(f"Created new identity and saved to {identity_file}")
-
-destination = RNS.Destination(identity, RNS.Destination.IN, RNS.Destination.SINGLE, APP_NAME)
-router = LXMF.LXMRouter(storagepath="./lxmf_storage")
-lxmf_destination = router.register_delivery_identity(identity)
+# Game logic runs under one lock since the router may deliver from several
+# threads; replies are built and sent on a single worker so the delivery
+# callback returns as soon as the command is processed, and replies go out
+# in the order their commands were processed
+_game_lock = threading.Lock()
+_send_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="zork-send")
 
 def message_received(message):
     """Handle incoming game commands"""
     sender_address = message.source_hash.hex()
     command_text = message.content.decode('utf-8').strip()
     
-    print(f"Received command '{command_text}' from {RNS.prettyhexrep(message.source_hash)}")
+    logger.info("Received command '%s' from %s", command_text, RNS.prettyhexrep(message.source_hash))
     
-    # Process command through game engine
-    response_text = game_engine.process_command(sender_address, command_text)
-    
-    # Send response (same LXMF code as before)
-    print(f"Sending response to {RNS.prettyhexrep(message.source_hash)}")
-    print(f"Response content: {response_text[:100]}...")
+    # Process command through game engine; the reply is queued under the
+    # same lock so send order matches processing order
+    with _game_lock:
+        response_text = game_engine.process_command(sender_address, command_text)
+        _send_pool.submit(_send_response, message.source_hash, getattr(message, 'destination', None), response_text)
+
+def _send_response(source_hash: bytes, fallback_destination, response_text: str):
+    """Send a reply to the player, from a _send_pool worker"""
+    pretty_hash = RNS.prettyhexrep(source_hash)
+    logger.info("Sending response to %s: %.100s...", pretty_hash, response_text)
     
     try:
         # Create a destination object for the sender to reply to
         # We need to recall their identity from their source hash
-        sender_identity = RNS.Identity.recall(message.source_hash)
+        sender_identity = RNS.Identity.recall(source_hash)
         if sender_identity is not None:
             # Create an outbound destination for the sender
             reply_destination = RNS.Destination(
@@ -1024,30 +1485,38 @@ def message_received(message):
             
             # Send the message through the router
             router.handle_outbound(response_message)
-            print(f"Response sent to {RNS.prettyhexrep(message.source_hash)}")
+            logger.info("Response sent to %s", pretty_hash)
             
         else:
-            print(f"Could not recall identity for {RNS.prettyhexrep(message.source_hash)}, trying alternative method...")
+            logger.info("Could not recall identity for %s, trying alternative method...", pretty_hash)
             
             # Alternative method: Try using the message source directly
             # This works if the incoming message has the sender's full destination info
-            if hasattr(message, 'destination') and message.destination is not None:
+            if fallback_destination is not None:
                 # Create response message using the original message's destination info
                 response_message = LXMF.LXMessage(
-                    message.destination,       # Reply to the original sender's destination
+                    fallback_destination,      # Reply to the original sender's destination
                     lxmf_destination,         # From our server
                     response_text,            # The game response
                     desired_method=LXMF.LXMessage.OPPORTUNISTIC  # Try opportunistic delivery
                 )
                 router.handle_outbound(response_message)
-                print(f"Response sent via alternative method to {RNS.prettyhexrep(message.source_hash)}")
+                logger.info("Response sent via alternative method to %s", pretty_hash)
             else:
-                print(f"Cannot send response - no valid destination found for {RNS.prettyhexrep(message.source_hash)}")
+                logger.warning("Cannot send response - no valid destination found for %s", pretty_hash)
                 
     except Exception as e:
-        print(f"Error sending response to {RNS.prettyhexrep(message.source_hash)}: {e}")
+        logger.error("Error sending response to %s: %s", pretty_hash, str(e))
+
+_shutdown = threading.Event()
+
+def _request_shutdown(signum, frame):
+    """SIGINT/SIGTERM handler: wake the main thread so it can shut down"""
+    _shutdown.set()
 
 def main():
+    signal.signal(signal.SIGINT, _request_shutdown)
+    signal.signal(signal.SIGTERM, _request_shutdown)
     router.register_delivery_callback(message_received)
     
     print("Scriptable Zork Server Initialized.")
@@ -1060,12 +1529,12 @@ def main():
     print("- Advanced command system")
     print("- Verb-object interactions")
     
-    while True:
-        time.sleep(1)
+    # Block until a shutdown signal arrives instead of waking every second
+    _shutdown.wait()
+    print("Shutting down Scriptable Zork server.")
+    _send_pool.shutdown(wait=True)
+    LOG_LISTENER.stop()
+    RNS.Reticulum.exit()
 
 if __name__ == "__main__":
-    try:
-        main()
-    except KeyboardInterrupt:
-        print("Shutting down Scriptable Zork server.")
-        RNS.Reticulum.exit()
\ No newline at end of file
+    main()